@@ -11,33 +11,33 @@ with psycopg.connect(PG_DSN, row_factory=dict_row, autocommit=True) as cx, cx.cu
                 (CAMPAIGN_KEY, "The Copper Cup"))
     camp_id = cur.fetchone()["id"]
 
-    # Insert nodes
-    name_to_id = {}
-    for n in DEFAULT_NODES:
-        cur.execute("""INSERT INTO story.nodes (campaign_id, key, description)
-                       VALUES (%s,%s,%s)
-                       ON CONFLICT (campaign_id, key) DO UPDATE SET description=EXCLUDED.description
-                       RETURNING id;""",
-                    (camp_id, n.key, n.description))
-        name_to_id[n.key] = cur.fetchone()["id"]
+    # Insert nodes (one statement over parallel arrays)
+    cur.execute("""INSERT INTO story.nodes (campaign_id, key, description)
+                   SELECT %s, k, d FROM unnest(%s::text[], %s::text[]) AS t(k, d)
+                   ON CONFLICT (campaign_id, key) DO UPDATE SET description=EXCLUDED.description
+                   RETURNING key, id;""",
+                (camp_id, [n.key for n in DEFAULT_NODES], [n.description for n in DEFAULT_NODES]))
+    name_to_id = {r["key"]: r["id"] for r in cur.fetchall()}
 
     # Insert edges
+    srcs, dsts = [], []
     for n in DEFAULT_NODES:
         src = name_to_id[n.key]
         for dst_key in n.connections:
             dst = name_to_id.get(dst_key)
             if not dst:
                 continue
-            cur.execute("""INSERT INTO story.edges (campaign_id, src_node_id, dst_node_id, kind)
-                           VALUES (%s,%s,%s,'linked')
-                           ON CONFLICT DO NOTHING;""",
-                        (camp_id, src, dst))
+            srcs.append(src)
+            dsts.append(dst)
+    cur.execute("""INSERT INTO story.edges (campaign_id, src_node_id, dst_node_id, kind)
+                   SELECT %s, s, d, 'linked' FROM unnest(%s::uuid[], %s::uuid[]) AS t(s, d)
+                   ON CONFLICT DO NOTHING;""",
+                (camp_id, srcs, dsts))
 
     # Beats
-    for i, text in enumerate(BEAT_LIST, start=1):
-        cur.execute("""INSERT INTO story.beats (campaign_id, ord, text)
-                       VALUES (%s,%s,%s)
-                       ON CONFLICT (campaign_id, ord) DO UPDATE SET text=EXCLUDED.text;""",
-                    (camp_id, i, text))
+    cur.execute("""INSERT INTO story.beats (campaign_id, ord, text)
+                   SELECT %s, o, x FROM unnest(%s::int[], %s::text[]) AS t(o, x)
+                   ON CONFLICT (campaign_id, ord) DO UPDATE SET text=EXCLUDED.text;""",
+                (camp_id, list(range(1, len(BEAT_LIST) + 1)), list(BEAT_LIST)))
 
 print("Seeded campaign:", CAMP_KEY := CAMPAIGN_KEY)
@@ -0,0 +1,5 @@
+-- story_get_node / story_list_adjacent look edges up from either endpoint
+-- within a campaign. Lookups by (campaign_id, src_node_id) already use the
+-- UNIQUE (campaign_id, src_node_id, dst_node_id, kind) index; the dst side
+-- needs its own.
+CREATE INDEX IF NOT EXISTS edges_camp_dst ON story.edges (campaign_id, dst_node_id);
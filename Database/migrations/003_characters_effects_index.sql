@@ -0,0 +1,13 @@
+-- characters_get_entity aggregates effects per entity and sums active
+-- ac_bonus effects (expires_at IS NULL OR expires_at > now()); effects only
+-- had its uuid primary key.
+--
+-- The other lookups the MCP tools make are already indexed by constraints:
+--   characters.entities  (session_id, name)               UNIQUE
+--   characters.inventory (entity_id, item_id)             PRIMARY KEY
+--   story.nodes          (campaign_id, key)               UNIQUE
+--   story.edges          (campaign_id, src_node_id, ...)  UNIQUE
+--   story.edges          (campaign_id, dst_node_id)       002_story_edge_indexes.sql
+CREATE INDEX IF NOT EXISTS effects_entity_expires ON characters.effects (entity_id, expires_at);
+
+ANALYZE characters.effects;
@@ -0,0 +1,12 @@
+-- story_search relies on the FTS column and a trigram index for its
+-- typo-tolerant fallback (replaces the old leading-wildcard ILIKE scan).
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE story.nodes ADD COLUMN IF NOT EXISTS search tsvector GENERATED ALWAYS AS (
+  to_tsvector('english', coalesce(key,'') || ' ' || coalesce(description,''))
+) STORED;
+CREATE INDEX IF NOT EXISTS nodes_search_idx ON story.nodes USING GIN (search);
+
+-- expression must match _Q_SEARCH_TRGM in storyMCP.py
+CREATE INDEX IF NOT EXISTS nodes_text_trgm
+  ON story.nodes USING GIN ((key || ' ' || coalesce(description, '')) gin_trgm_ops);
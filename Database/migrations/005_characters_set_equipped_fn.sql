@@ -0,0 +1,42 @@
+-- characters_set_equipped calls this to look up entity/inventory and toggle
+-- `equipped` in one round trip. MCP_data_characters._ensure_schema() also runs
+-- this file once per process, since docker-entrypoint-initdb.d skips migrations/.
+-- Returns a single (err, was_equipped, now_equipped) row; err is
+-- NO_ENTITY / NO_ITEM / NO_INVENTORY or NULL.
+--
+-- items.name is not unique, so the item is resolved through the entity's own
+-- inventory; NO_ITEM only means no item by that name exists at all.
+CREATE OR REPLACE FUNCTION characters.set_equipped(
+  p_entity uuid, p_session uuid, p_item text, p_equipped boolean
+) RETURNS TABLE (err text, was_equipped boolean, now_equipped boolean)
+LANGUAGE plpgsql AS $fn$
+DECLARE
+  v_item uuid;
+BEGIN
+  PERFORM 1 FROM characters.entities WHERE id = p_entity AND session_id = p_session;
+  IF NOT FOUND THEN
+    err := 'NO_ENTITY'; RETURN NEXT; RETURN;
+  END IF;
+
+  SELECT inv.item_id, inv.equipped INTO v_item, was_equipped
+  FROM characters.inventory inv
+  JOIN characters.items i ON i.id = inv.item_id
+  WHERE inv.entity_id = p_entity AND i.name = p_item
+  LIMIT 1
+  FOR UPDATE OF inv;
+  IF NOT FOUND THEN
+    PERFORM 1 FROM characters.items WHERE name = p_item;
+    IF NOT FOUND THEN
+      err := 'NO_ITEM';
+    ELSE
+      err := 'NO_INVENTORY';
+    END IF;
+    RETURN NEXT; RETURN;
+  END IF;
+
+  UPDATE characters.inventory inv
+  SET equipped = p_equipped
+  WHERE inv.entity_id = p_entity AND inv.item_id = v_item
+  RETURNING inv.equipped INTO now_equipped;
+  RETURN NEXT;
+END $fn$;
@@ -103,3 +103,18 @@ def test_list_and_get_roundtrip():
         )
     )
     assert res2.ok, f"idempotent replay failed: {res2.error}"
+
+
+def test_set_equipped_unknown_session_is_no_entity():
+    # A well-formed but unknown session_id must map to NO_ENTITY, not a raw FK error
+    res = characters_set_equipped(
+        SetEquippedIn(
+            session_id=str(uuid.uuid4()),
+            entity_id=str(uuid.uuid4()),
+            item_name="Greatsword",
+            equipped=True,
+            request_id=str(uuid.uuid4()),
+        )
+    )
+    assert not res.ok
+    assert res.error["code"] == "NO_ENTITY", f"unexpected error: {res.error}"
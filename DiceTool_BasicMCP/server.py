@@ -2,9 +2,14 @@
 # mcp>=1.7  OR  fastmcp>=2.0
 # uvicorn fastapi pydantic>=2 psycopg[binary] (if/when you add HTTP & DB)
 
+import os
+import re
 import secrets
-from typing import List, Dict, Optional
-from pydantic import BaseModel, Field
+import struct
+import threading
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 
 try:
     # High-level helper (nice ergonomics)
@@ -14,8 +19,48 @@ except Exception:
     fastmcp_available = False
     from mcp.server import Server  # official low-level server if needed
 
+try:
+    # Optional: vectorized draws for large rolls (pip install dm-dice[fast])
+    import numpy as np
+    numpy_available = True
+except Exception:
+    numpy_available = False
+
 # ---------- Domain layer (Open Architecture OOP dice engine) ----------
 
+_U64 = 1 << 64
+_I64_LIMIT = 1 << 63
+_NUMPY_MIN_COUNT = 256  # below this the urandom batch is already cheaper than a numpy round-trip
+# Rolls stay on the CSPRNG by default. DICE_FAST_RNG=1 (with numpy installed) opts large rolls into
+# a single PCG64 draw: fast and unbiased, but predictable to anyone who recovers the generator state.
+_FAST_RNG = numpy_available and os.getenv("DICE_FAST_RNG") == "1"
+_rng = None
+
+def _get_rng():
+    global _rng
+    if _rng is None:
+        _rng = np.random.default_rng()  # seeded from OS entropy
+    return _rng
+
+def _roll_many(count: int, sides: int) -> List[int]:
+    """Roll `count` dice with `sides` faces. Multi-die rolls read os.urandom once instead of per die.
+
+    With _FAST_RNG on, rolls of _NUMPY_MIN_COUNT+ dice use one numpy PCG64 draw instead (not a CSPRNG).
+    """
+    if count == 1:
+        return [secrets.randbelow(sides) + 1]
+    if sides < 1:
+        raise ValueError("dice need at least one side")
+    # numpy draws int64, so faces past 2**63 - 1 stay on the urandom path
+    if _FAST_RNG and count >= _NUMPY_MIN_COUNT and sides < _I64_LIMIT:
+        return _get_rng().integers(1, sides + 1, size=count).tolist()
+    # Values in the short tail above `limit` would bias low faces; re-draw those (rare) ones.
+    limit = _U64 - _U64 % sides
+    return [
+        (v % sides if v < limit else secrets.randbelow(sides)) + 1
+        for v in struct.unpack(f"<{count}Q", os.urandom(count * 8))
+    ]
+
 class RollDetail(BaseModel):
     count: int
     sides: int
@@ -25,11 +70,42 @@ class RollDetail(BaseModel):
     dropped: Optional[List[int]] = None
     notes: Optional[str] = None
 
+# Fixed-shape 1d20 rolls (attacks, saves, checks) are most of what gets rolled.
+# These build the breakdown directly instead of going through RollDetail validation.
+def _core_d20(modifier: int) -> Dict:
+    r = _roll_many(1, 20)
+    return {"total": r[0] + modifier, "breakdown": {
+        "count": 1, "sides": 20, "modifier": modifier,
+        "rolls": r, "kept": None, "dropped": None, "notes": None,
+    }}
+
+def _adv_d20(modifier: int) -> Dict:
+    # One draw for both dice
+    a, b = _roll_many(2, 20)
+    hi = a if a > b else b
+    lo = a + b - hi
+    return {"total": hi + modifier, "breakdown": {
+        "count": 2, "sides": 20, "modifier": modifier,
+        "rolls": [a, b], "kept": [hi], "dropped": [lo],
+        "notes": "advantage: kept highest",
+    }}
+
+def _dis_d20(modifier: int) -> Dict:
+    a, b = _roll_many(2, 20)
+    hi = a if a > b else b
+    lo = a + b - hi
+    return {"total": lo + modifier, "breakdown": {
+        "count": 2, "sides": 20, "modifier": modifier,
+        "rolls": [a, b], "kept": [lo], "dropped": [hi],
+        "notes": "disadvantage: kept lowest",
+    }}
+
 class DicePolicy:
     """Base policy: override .roll for variants (advantage, disadvantage, exploding, etc.)."""
+    __slots__ = ()  # policies are stateless
     id = "core.v1"
     def roll(self, count: int, sides: int, modifier: int = 0) -> Dict:
-        rolls = [secrets.randbelow(sides) + 1 for _ in range(count)]
+        rolls = _roll_many(count, sides)
         total = sum(rolls) + modifier
         detail = RollDetail(
             count=count, sides=sides, modifier=modifier, rolls=rolls
@@ -37,68 +113,75 @@ class DicePolicy:
         return {"total": total, "breakdown": detail.model_dump()}
 
 class CorePolicy(DicePolicy):
+    __slots__ = ()
     id = "core.v1"
 
 class AdvantagePolicy(DicePolicy):
     """5e-style advantage: intended for d20 checks/attacks. If not 1d20, falls back to core semantics."""
+    __slots__ = ()
     id = "advantage.v1"
     def roll(self, count: int, sides: int, modifier: int = 0) -> Dict:
         # Advantage is defined for a single d20 check; keep graceful fallback.
         if count == 1 and sides == 20:
-            a = secrets.randbelow(20) + 1
-            b = secrets.randbelow(20) + 1
-            kept_val = max(a, b)
-            total = kept_val + modifier
-            detail = RollDetail(
-                count=2, sides=20, modifier=modifier,
-                rolls=[a, b], kept=[kept_val],
-                dropped=[min(a, b)], notes="advantage: kept highest"
-            )
-            return {"total": total, "breakdown": detail.model_dump()}
+            return _adv_d20(modifier)
         # Fallback: behave like core (sum all dice)
         return super().roll(count, sides, modifier)
 
 class DisadvantagePolicy(DicePolicy):
     """5e-style disadvantage: intended for d20 checks/attacks."""
+    __slots__ = ()
     id = "disadvantage.v1"
     def roll(self, count: int, sides: int, modifier: int = 0) -> Dict:
         if count == 1 and sides == 20:
-            a = secrets.randbelow(20) + 1
-            b = secrets.randbelow(20) + 1
-            kept_val = min(a, b)
-            total = kept_val + modifier
-            detail = RollDetail(
-                count=2, sides=20, modifier=modifier,
-                rolls=[a, b], kept=[kept_val],
-                dropped=[max(a, b)], notes="disadvantage: kept lowest"
-            )
-            return {"total": total, "breakdown": detail.model_dump()}
+            return _dis_d20(modifier)
         return super().roll(count, sides, modifier)
 
+_DICE_RE = re.compile(r"(\d+)d(\d+)([+-]\d+)?", re.I)
+
+@lru_cache(maxsize=1024)
+def _parse(formula: str) -> Tuple[int, int, int]:
+    """Parse "XdY+Z" / "XdY-Z" into (count, sides, modifier); cached per formula string."""
+    m = _DICE_RE.fullmatch(formula)
+    if not m:
+        raise ValueError(f"Unsupported formula: {formula}")
+    return int(m[1]), int(m[2]), int(m[3]) if m[3] else 0
+
+# Policies are stateless, so one shared instance each (aliases point at the same object).
+_CORE = CorePolicy()
+_ADV = AdvantagePolicy()
+_DIS = DisadvantagePolicy()
+_POLICIES = {
+    CorePolicy.id: _CORE,
+    AdvantagePolicy.id: _ADV,
+    DisadvantagePolicy.id: _DIS,
+    # aliases are handy if you want shorter names:
+    "adv": _ADV,
+    "dis": _DIS,
+}
+
 class DiceEngine:
     def __init__(self):
-        # We can add policies here; (exploding, keep-highest-N, fate, house rules, etc.)
-        self.policies = {
-            CorePolicy.id: CorePolicy(),
-            AdvantagePolicy.id: AdvantagePolicy(),
-            DisadvantagePolicy.id: DisadvantagePolicy(),
-            # aliases are handy if you want shorter names:
-            "adv": AdvantagePolicy(),
-            "dis": DisadvantagePolicy(),
-        }
+        # We can add policies per engine (exploding, keep-highest-N, fate, house rules, etc.);
+        # the copy keeps one engine's registrations out of every other engine's table.
+        self.policies = dict(_POLICIES)
 
     def run(self, formula: str, policy: str = "core.v1"):
         """
         Very small parser: "XdY+Z" or "XdY-Z".
         Advantage/disadvantage are selected via policy ("advantage.v1"/"disadvantage.v1").
         """
-        import re
-        m = re.fullmatch(r"(\d+)d(\d+)([+-]\d+)?", formula, re.I)
-        if not m:
-            raise ValueError(f"Unsupported formula: {formula}")
-        c, s = int(m[1]), int(m[2])
-        mod = int(m[3]) if m[3] else 0
-        policy_impl = self.policies.get(policy, self.policies["core.v1"])
+        c, s, mod = _parse(formula)
+        # unknown ids fall back to this engine's own core policy (it may be overridden)
+        policy_impl = self.policies.get(policy) or self.policies["core.v1"]
+        # 1d20 fast paths apply only to the shared built-in singletons (checked by identity, never hashed),
+        # so aliases hit them and a custom policy registered under any id always gets its own roll().
+        if c == 1 and s == 20:
+            if policy_impl is _CORE:
+                return _core_d20(mod)
+            if policy_impl is _ADV:
+                return _adv_d20(mod)
+            if policy_impl is _DIS:
+                return _dis_d20(mod)
         return policy_impl.roll(c, s, mod)
 
 engine = DiceEngine()
@@ -106,25 +189,56 @@ engine = DiceEngine()
 # ---------- MCP layer (tools) ----------
 
 class RollInput(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
     formula: str = Field(description="Dice like '2d20+7' or '1d8+3'")
     policy: str = Field(default="core.v1", description="House rule policy id (e.g., 'core.v1', 'advantage.v1', 'disadvantage.v1')")
 
 class RollOutput(BaseModel):
+    # Built by roll_dice with model_construct: every field comes from the engine, so it is not revalidated.
+    model_config = ConfigDict(frozen=True)
     total: int
     breakdown: Dict
     policy: str
     request_id: str
 
+# Request ids are sliced from a 4 KiB os.urandom buffer (512 ids per syscall), refilled when spent.
+_ID_BUF_SIZE = 4096
+_id_buf = b""
+_id_off = 0
+_id_lock = threading.Lock()
+_id_urandom = os.urandom  # own alias, so dice-draw patches of os.urandom never reach the id buffer
+
+def _reset_after_fork() -> None:
+    # A forked child must not hand out the ids its parent still has buffered,
+    # nor replay the parent's PCG64 stream for large rolls.
+    global _id_buf, _id_off, _rng
+    _id_buf, _id_off = b"", 0
+    _rng = None
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def _request_id() -> str:
+    # Correlation id, not a secret: read the bytes directly rather than going through secrets.token_hex.
+    global _id_buf, _id_off
+    with _id_lock:
+        off = _id_off
+        if off + 8 > len(_id_buf):
+            _id_buf, off = _id_urandom(_ID_BUF_SIZE), 0
+        _id_off = off + 8
+        chunk = _id_buf[off:off + 8]
+    return chunk.hex()
+
 if fastmcp_available:
     mcp = FastMCP("dm-dice")
     @mcp.tool()
     def roll_dice(input: RollInput) -> RollOutput:
         result = engine.run(input.formula, input.policy)
-        return RollOutput(
+        return RollOutput.model_construct(
             total=result["total"],
             breakdown=result["breakdown"],
             policy=input.policy,
-            request_id=secrets.token_hex(8),
+            request_id=_request_id(),
         )
 else:
     # Fallback to lower-level server (same behavior, more boilerplate)
@@ -133,11 +247,11 @@ else:
     @mcp.tool("roll_dice", input_model=RollInput, output_model=RollOutput)
     async def roll_dice(input: RollInput) -> RollOutput:  # type: ignore
         result = engine.run(input.formula, input.policy)
-        return RollOutput(
+        return RollOutput.model_construct(
             total=result["total"],
             breakdown=result["breakdown"],
             policy=input.policy,
-            request_id=secrets.token_hex(8),
+            request_id=_request_id(),
         )
 
 if __name__ == "__main__":
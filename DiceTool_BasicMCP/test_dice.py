@@ -1,31 +1,49 @@
 import asyncio
+import dataclasses
 import inspect
 import importlib
 import json
 import secrets
+import struct
 import types
 import pytest
 import server
 
 
 
+@pytest.fixture(scope="session")
+def session_loop(): # One event loop shared by every async tool call instead of one per test.
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
 @pytest.fixture
 def set_randbelow(monkeypatch): # Let's you set deterministic rand for consistent tests.
  
-    # Patch secrets.randbelow with a sequence of predetermined integers.
-    # Values must already be in [0, sides-1] for the call's sides.
+    # Patch secrets.randbelow (single die) and os.urandom (batched multi-die draws in server._roll_many)
+    # with one shared sequence of predetermined integers, so the real _roll_many still runs.
+    # Request ids use their own server._id_urandom alias and are unaffected.
+    # randbelow values must already be in [0, sides-1]; urandom values are raw 64-bit draws
+    # (anything in [0, sides-1] maps straight to that face, values at or above the rejection limit get re-drawn).
 
     def _set(values):
         it = iter(values)
-        def fake_randbelow(sides: int) -> int:
+        def _next():
             try:
-                v = next(it)
+                return next(it)
             except StopIteration:
                 raise AssertionError("Not enough mocked random values for this test.")
+        def fake_randbelow(sides: int) -> int:
+            v = _next()
             if not (0 <= v < sides):
                 raise AssertionError(f"Mock value {v} out of range for sides={sides}")
             return v
+        def fake_urandom(n: int) -> bytes:
+            # request ids read through server._id_urandom, so every call here is a dice draw
+            return struct.pack(f"<{n // 8}Q", *(_next() for _ in range(n // 8)))
         monkeypatch.setattr(secrets, "randbelow", fake_randbelow)
+        monkeypatch.setattr(server.os, "urandom", fake_urandom)
     return _set
 
 
@@ -41,10 +59,51 @@ def test_core_policy_sum_and_modifier(set_randbelow):
     assert br["modifier"] == 3
     assert br.get("kept") is None and br.get("dropped") is None
 
+def test_roll_many_rejects_biased_tail(set_randbelow):
+    # 2d6: 2**64 - 1 is above the rejection limit for sides=6, so that die is re-drawn via randbelow.
+    set_randbelow([2**64 - 1, 3, 4])  # urandom -> [rejected, 3]; randbelow -> 4
+    assert server._roll_many(2, 6) == [5, 4]
+
+def test_roll_many_batched_draw_in_range():
+    rolls = server._roll_many(200, 6)
+    assert len(rolls) == 200
+    assert all(1 <= r <= 6 for r in rolls)
+
+def test_scripted_urandom_reaches_512_die_roll(set_randbelow):
+    # 512 dice request exactly _ID_BUF_SIZE bytes; they must still get the scripted values
+    set_randbelow([5] * 512)
+    assert server._roll_many(512, 6) == [6] * 512
+
+def test_request_ids_unique_across_buffer_refill():
+    ids = [server._request_id() for _ in range(server._ID_BUF_SIZE // 8 + 10)]
+    assert len(set(ids)) == len(ids)
+    assert all(len(i) == 16 for i in ids)
+
+def test_roll_many_numpy_draw_in_range(monkeypatch):
+    pytest.importorskip("numpy")
+    n = server._NUMPY_MIN_COUNT
+    monkeypatch.setattr(server, "_rng", None)
+    monkeypatch.setattr(server, "_FAST_RNG", False)
+    server._roll_many(n, 6)
+    assert server._rng is None  # default stays on the CSPRNG
+    monkeypatch.setattr(server, "_FAST_RNG", True)
+    rolls = server._roll_many(n, 6)
+    assert server._rng is not None
+    assert len(rolls) == n and all(1 <= r <= 6 for r in rolls)
+    # faces beyond int64 fall back to the urandom path instead of raising
+    rolls = server._roll_many(n, 2**64)
+    assert len(rolls) == n and all(1 <= r <= 2**64 for r in rolls)
+    server._reset_after_fork()
+    assert server._rng is None  # a forked child re-seeds instead of sharing the parent's stream
+
 def test_invalid_formula_raises():
     with pytest.raises(ValueError):
         server.engine.run("d20+5")  # missing count
 
+def test_roll_input_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        server.RollInput(formula="1d20+0", polcy="adv")  # typo'd field is an error, not silently dropped
+
 def test_advantage_policy_keeps_highest(set_randbelow):
     # For advantage on 1d20+7, produce 2 and 19  -> feed 1 and 18
     set_randbelow([1, 18])
@@ -84,6 +143,33 @@ def test_policy_aliases_adv_and_dis(set_randbelow):
     r2 = server.engine.run("1d20+0", "dis")
     assert r2["breakdown"]["kept"] == [11]
 
+def test_engine_policy_tables_are_independent():
+    e1 = server.DiceEngine()
+    e1.policies["house.v1"] = server.CorePolicy()
+    assert "house.v1" not in server.DiceEngine().policies
+    assert "house.v1" not in server._POLICIES
+
+def test_custom_policy_overrides_d20_fast_path():
+    class Fixed(server.DicePolicy):
+        __slots__ = ()
+        def roll(self, count, sides, modifier=0):
+            return {"total": 42, "breakdown": {}}
+    e = server.DiceEngine()
+    e.policies["core.v1"] = Fixed()
+    assert e.run("1d20+0", "core.v1")["total"] == 42
+    assert e.run("2d20+0", "core.v1")["total"] == 42
+    assert e.run("2d6+0", "no-such-policy")["total"] == 42  # unknown ids use the engine's core.v1
+
+def test_unhashable_custom_policy():
+    @dataclasses.dataclass  # eq=True without frozen makes instances unhashable
+    class DC(server.DicePolicy):
+        total: int = 7
+        def roll(self, count, sides, modifier=0):
+            return {"total": self.total, "breakdown": {}}
+    e = server.DiceEngine()
+    e.policies["dc"] = DC()
+    assert e.run("1d20+0", "dc")["total"] == 7
+
 
 # MCP tool handler test
 @pytest.mark.parametrize("policy, seq, expected_total", [
@@ -91,7 +177,7 @@ def test_policy_aliases_adv_and_dis(set_randbelow):
     ("advantage.v1", [1, 18], 26),     # keep 19 + 7
     ("disadvantage.v1", [16, 3], 6),   # keep 4 + 2
 ])
-def test_roll_dice_tool_sync_or_async(set_randbelow, policy, seq, expected_total):
+def test_roll_dice_tool_sync_or_async(set_randbelow, session_loop, policy, seq, expected_total):
     
     # Calls the exported roll_dice tool. 
     # Works for both FastMCP (sync) and Server (async) branches.
@@ -109,7 +195,7 @@ def test_roll_dice_tool_sync_or_async(set_randbelow, policy, seq, expected_total
     # Invoke tool (could be sync function or async coroutine)
     out = server.roll_dice(roll_input)
     if inspect.iscoroutine(out):
-        out = asyncio.get_event_loop().run_until_complete(out)
+        out = session_loop.run_until_complete(out)
 
     assert isinstance(out, server.RollOutput)
     assert out.total == expected_total
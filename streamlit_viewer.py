@@ -5,11 +5,11 @@ import streamlit as st
 
 
 def load_snapshot(path: Path) -> dict:
-    if not path.exists():
+    try:
+        return json.loads(path.read_bytes())
+    except FileNotFoundError:
         st.warning(f"Snapshot file not found: {path}")
         return {}
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
     except Exception as exc:
         st.error(f"Failed to read snapshot: {exc}")
         return {}